@@ -1,9 +1,10 @@
 from __future__ import print_function
 import objc
 import sys, os, re
+import codecs
 from objc import super
 
-from Foundation import NSLog, NSString, NSUTF8StringEncoding
+from Foundation import NSLog, NSData
 from AppKit import NSApplication, NSDocumentController, NSDocument, NSMenuItem
 
 from GlyphsApp import Glyphs, FILE_MENU
@@ -52,13 +53,24 @@ class DrawBotDocument (NSDocument):
 	# 	pass
 	
 	def dataRepresentationOfType_(self, aType):
-		if len(self.text) > 0:
-			return NSString.stringWithString_(self.text).dataUsingEncoding_(NSUTF8StringEncoding)
+		text = self.text
+		if self.windowControllers():
+			# the code view does not update the text continuously, get the current text from it
+			text = self.windowController().code()
+		if len(text) > 0:
+			data = text.encode("utf-8")
+			return NSData.dataWithBytes_length_(data, len(data))
 		else:
-			NSdata.data()
+			return NSData.data()
 	
 	def loadDataRepresentation_ofType_(self, data, aType):
-		self.text = NSString.alloc().initWithData_encoding_(data, NSUTF8StringEncoding)
+		# data.bytes() is not always a buffer, for empty data it can be None
+		buffer = bytes(data)
+		try:
+			self.text = codecs.decode(buffer, "utf-8")
+		except UnicodeDecodeError:
+			# only pay for the replacing decoder when the file is not valid utf-8
+			self.text = codecs.decode(buffer, "utf-8", "replace")
 		return True
 	
 	def writableTypes(self):
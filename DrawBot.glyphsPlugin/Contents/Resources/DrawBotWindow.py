@@ -1,16 +1,13 @@
 from __future__ import print_function
 
 import AppKit
-from AppKit import NSWindowController, NSToolbarFlexibleSpaceItemIdentifier, NSToolbarSpaceItemIdentifier, NSContinuouslyUpdatesValueBindingOption, NSImage, NSString, NSShadow, NSFont, NSFontAttributeName, NSForegroundColorAttributeName, NSShadowAttributeName, NSDocumentController, NSBezierPath
-from Foundation import NSUserDefaults
+from AppKit import NSWindowController, NSContinuouslyUpdatesValueBindingOption, NSBezierPath, NSNotificationCenter, NSUserDefaultsDidChangeNotification
 import objc
 from objc import super
 
 import sys, os
 import traceback
 
-from GlyphsApp import GetSaveFile
-
 from vanilla import *
 import vanilla.dialogs
 
@@ -18,7 +15,7 @@ from drawBot.context.drawBotContext import DrawBotContext
 from drawBot.context.baseContext import BezierPath
 from drawBot.drawBotDrawingTools import _drawBotDrawingTool
 from drawBot.misc import getDefault, setDefault, warnings
-from drawBot.scriptTools import ScriptRunner, CallbackRunner, StdOutput
+from drawBot.scriptTools import ScriptRunner, CallbackRunner, StdOutput, CompiledCodeCache, coalesceOutput
 from drawBot.ui.codeEditor import CodeEditor, OutPutEditor
 from drawBot.ui.drawView import DrawView, ThumbnailView
 from drawBot.ui.splitView import SplitView
@@ -26,17 +23,33 @@ from drawBot.ui.splitView import SplitView
 
 sys.path.append(os.path.dirname(__file__))
 
+# merged glyph paths of layers without components, only kept during a run
+_glyphPathCache = {}
+
 def drawGlyph(glyph):
-	BezierPath = glyph._layer.bezierPath
-	if BezierPath != None:
-		BezierPath = BezierPath.copy()
+	layer = glyph._layer
+	OriginalBezierPath = layer.bezierPath
+	OpenBezierPath = layer.openBezierPath
+	components = layer.components
+	# a component path depends on its transform and on the base glyph, only cache layers without components
+	key = None
+	if not components:
+		key = (layer, OriginalBezierPath, OpenBezierPath)
+		BezierPath = _glyphPathCache.get(key)
 	else:
-		BezierPath = NSBezierPath.bezierPath()
-	OpenBezierPath = glyph._layer.openBezierPath
-	if OpenBezierPath:
-		BezierPath.appendBezierPath_(OpenBezierPath)
-	for currComponent in glyph._layer.components:
-		BezierPath.appendBezierPath_(currComponent.bezierPath)
+		BezierPath = None
+	if BezierPath is None:
+		if OriginalBezierPath != None:
+			BezierPath = OriginalBezierPath.copy()
+		else:
+			BezierPath = NSBezierPath.bezierPath()
+		appendBezierPath = BezierPath.appendBezierPath_
+		if OpenBezierPath:
+			appendBezierPath(OpenBezierPath)
+		for currComponent in components:
+			appendBezierPath(currComponent.bezierPath)
+		if key is not None:
+			_glyphPathCache[key] = BezierPath
 	_drawBotDrawingTool.drawPath(BezierPath)
 
 _drawBotDrawingTool.drawGlyph = drawGlyph
@@ -44,14 +57,14 @@ _drawBotDrawingTool.drawGlyph = drawGlyph
 class GSBezierPathDraw(BezierPath):
 
 	def addGlyph(self, glyph):
-		BezierPath = glyph._layer.bezierPath()
+		layer = glyph._layer
+		# appendBezierPath_ copies the elements, so no merged copy of the glyph is needed
+		appendBezierPath = self.getNSBezierPath().appendBezierPath_
+		BezierPath = layer.bezierPath()
 		if BezierPath != None:
-			BezierPath = BezierPath.copy()
-		else:
-			BezierPath = NSBezierPath.bezierPath()
-		for currComponent in glyph._layer.components:
-			BezierPath.appendBezierPath_(currComponent.bezierPath())
-		self.getNSBezierPath().appendBezierPath_(BezierPath)
+			appendBezierPath(BezierPath)
+		for currComponent in layer.components:
+			appendBezierPath(currComponent.bezierPath())
 
 _drawBotDrawingTool._bezierPathClass = GSBezierPathDraw
 
@@ -66,6 +79,13 @@ class GlyphsDrawBotController(NSWindowController):
 	def init(self):
 		self = super(GlyphsDrawBotController, self).init()
 		document = None
+		# keep the compiled code of the last runs around
+		self._codeCache = CompiledCodeCache()
+		# the namespace with all tool callbacks, copied for each run
+		self._protoNamespace = None
+		# keep the clear output preference around, it is checked on every run
+		self._clearOutput = getDefault("DrawBotClearOutput", True)
+		NSNotificationCenter.defaultCenter().addObserver_selector_name_object_(self, "userDefaultsChanged:", NSUserDefaultsDidChangeNotification, None)
 		# make a window
 		self.w = Window((400, 400), "DrawBot", minSize=(200, 200), textured=False)
 		# setting previously stored frames, if any
@@ -82,7 +102,8 @@ class GlyphsDrawBotController(NSWindowController):
 
 		# the code editor
 		self.codeView = CodeEditor((0, 0, -0, -0))
-		self.codeView.getNSTextView().bind_toObject_withKeyPath_options_("value", self, "document.text", {NSContinuouslyUpdatesValueBindingOption:True})
+		# the text is only pushed to the document when editing ends, use `code()` to get the current text
+		self.codeView.getNSTextView().bind_toObject_withKeyPath_options_("value", self, "document.text", {NSContinuouslyUpdatesValueBindingOption:False})
 		scrollview = self.codeView.getNSTextView().enclosingScrollView()
 		scrollview.setBorderType_(0)
 		
@@ -128,35 +149,39 @@ class GlyphsDrawBotController(NSWindowController):
 		# set the split view dividers at a specific position based on the window size
 		self.w.split.setDividerPosition(0, 0)
 		self.w.split.setDividerPosition(1, windowWidth * .6)
-		self.w.split.setDividerPosition(1, windowWidth * .6)
 		self.codeSplit.setDividerPosition(0, windowHeight * .7)
 		
 		return self
 
 	def __del__(self):
+		NSNotificationCenter.defaultCenter().removeObserver_(self)
 		self.codeView.getNSTextView().unbind_("value")
 
+	def userDefaultsChanged_(self, notification):
+		self._clearOutput = getDefault("DrawBotClearOutput", True)
+
 	@objc.python_method
 	def runCode(self, liveCoding=False):
+		self.output = None
+		self.stdout = None
+		self.stderr = None
 		# get the code
 		try:
 			code = self.code()
 			# get the path of the document (will be None for an untitled document)
-			path = None
-			try:
-				path = self.document().fileURL().path()
-			except:
-				pass
+			path = self._documentPath()
 			# reset the internal warning system
 			warnings.resetWarnings()
 			# reset the drawing tool
 			_drawBotDrawingTool.newDrawing()
 			# create a namespace
-			namespace = {} # DrawBotNamespace(_drawBotDrawingTool, _drawBotDrawingTool._magicVariables)
-			# add the tool callbacks in the name space
-			_drawBotDrawingTool._addToNamespace(namespace)
+			if self._protoNamespace is None:
+				self._protoNamespace = {} # DrawBotNamespace(_drawBotDrawingTool, _drawBotDrawingTool._magicVariables)
+				# add the tool callbacks in the name space
+				_drawBotDrawingTool._addToNamespace(self._protoNamespace)
+			namespace = dict(self._protoNamespace)
 			# when enabled clear the output text view
-			if getDefault("DrawBotClearOutput", True):
+			if self._clearOutput:
 				self.outPutView.clear()
 			# create a new std output, catching all print statements and tracebacks
 			self.output = []
@@ -171,11 +196,12 @@ class GlyphsDrawBotController(NSWindowController):
 			# warnings should show the warnings
 			warnings.shouldShowWarnings = True
 			# run the code
-			ScriptRunner(code, path, namespace=namespace, stdout=self.stdout, stderr=self.stderr)
+			ScriptRunner(code, path, namespace=namespace, stdout=self.stdout, stderr=self.stderr, codeCache=self._codeCache)
 			# warnings should stop posting them
 			warnings.shouldShowWarnings = False
-			# set context, only when the panes are visible
-			if self.w.split.isPaneVisible("drawView") or self.w.split.isPaneVisible("thumbnails"):
+			# set context, only when the panes are visible and the script did draw something
+			panesVisible = self.w.split.isPaneVisible("drawView") or self.w.split.isPaneVisible("thumbnails")
+			if panesVisible and _drawBotDrawingTool._instructionsStack:
 				def createContext(context):
 					# draw the tool in to the context
 					_drawBotDrawingTool._drawInContext(context)
@@ -190,52 +216,78 @@ class GlyphsDrawBotController(NSWindowController):
 					self.drawView.setPDFDocument(pdfDocument)
 				# scroll to the original position
 				self.drawView.scrollToPageIndex(selectionIndex)
-			else:
-				# if the panes are not visible, clear the draw view
+			elif not panesVisible or not liveCoding:
+				# if the panes are not visible or there is no drawing, clear the draw view
 				self.drawView.setPDFDocument(None)
 			# drawing is done
 			_drawBotDrawingTool.endDrawing()
 			# set the catched print statements and tracebacks in the the output text view
-			for text, isError in self.output:
-				if liveCoding and isError:
-					continue
-				self.outPutView.append(text, isError)
+			self._flushOutput(liveCoding)
 
 			# reset the code backup if the script runs with any crashes
 			#setDefault("pythonCodeBackup", None)
-			# clean up
-
+		except Exception:
+			# show the output written before the error first
+			self._flushOutput(liveCoding)
+			# errors in the runner itself, show them in the output view with a single append
+			self.outPutView.append("-- Internal error\n%s" % traceback.format_exc(), True)
+		finally:
+			# nothing printed may get lost, whatever way the run ended
+			self._flushOutput(liveCoding)
+			# clean up, the glyph paths are not kept alive after the run
+			_glyphPathCache.clear()
 			self.output = None
 			self.stdout = None
 			self.stderr = None
-		except Exception as e:
-			print("-- Error", e)
-			print(traceback.format_exc())
-			print("-- Error/")
+
+	@objc.python_method
+	def _flushOutput(self, liveCoding=False):
+		if self.stdout is None:
+			return
+		if self.stdout.outputView is not None:
+			# with a live output view only the pending writes have to be flushed
+			self.stdout.flush()
+		else:
+			output = self.output
+			if liveCoding:
+				output = [(text, isError) for text, isError in output if not isError]
+			for text, isError in coalesceOutput(output):
+				self.outPutView.append(text, isError)
+			del self.output[:]
 
 	@objc.python_method
 	def checkSyntax(self, sender=None):
 		# get the code
 		code = self.code()
 		# get te path of the document (will be None for an untitled document)
-		path = self.path()
+		path = self._documentPath()
 		# when enabled clear the output text view
-		if getDefault("DrawBotClearOutput", True):
+		if self._clearOutput:
 			self.outPutView.set("")
 		# create a new std output, catching all print statements and tracebacks
 		self.output = []
 		self.stdout = StdOutput(self.output)
 		self.stderr = StdOutput(self.output, True)
 		# run the code, but with the optional flag checkSyntaxOnly so it will just compile the code
-		ScriptRunner(code, path, stdout=self.stdout, stderr=self.stderr, checkSyntaxOnly=True)
+		ScriptRunner(code, path, stdout=self.stdout, stderr=self.stderr, checkSyntaxOnly=True, codeCache=self._codeCache)
 		# set the catched print statements and tracebacks in the the output text view
-		for text, isError in self.output:
+		for text, isError in coalesceOutput(self.output):
 			self.outPutView.append(text, isError)
 		# clean up
 		self.output = None
 		self.stdout = None
 		self.stderr = None
 
+	@objc.python_method
+	def _documentPath(self):
+		document = self.document()
+		if document is None:
+			return None
+		url = document.fileURL()
+		if url is None:
+			return None
+		return url.path()
+
 	@objc.python_method
 	def _savePDF(self, path):
 		# get the pdf date from the draw view
@@ -256,7 +308,7 @@ class GlyphsDrawBotController(NSWindowController):
 		"""
 		Returns the content of the code view as a string.
 		"""
-		return self.document().text
+		return self.codeView.get()
 
 	@objc.python_method
 	def setCode(self, code):
@@ -302,6 +354,7 @@ class GlyphsDrawBotController(NSWindowController):
 		self.codeView.dedent()
 	
 	def toolbarReload_(self, sender):
+		self._protoNamespace = None
 		self.codeView.reload()
 	
 	def exportFontAction_(self, sender): # new API in Glyphs 3
@@ -8,6 +8,7 @@ import Quartz
 
 import math
 import os
+from collections import OrderedDict, namedtuple
 
 from fontTools.pens.basePen import BasePen
 
@@ -37,11 +38,66 @@ try:
 except:
     CoreText.kCTTrackingAttributeName = "CTTracking"
 
+# CoreText reads OpenType feature tags directly from macOS 10.13,
+# older versions need the AAT feature type and selector
+_useNSFontFeatures = macOSVersion < (10, 13)
+# tracking is set as kerning before macOS 10.12
+_useKernForTracking = macOSVersion < (10, 12)
+
+# NSFont objects by (fontName, fontSize), cleared whenever fonts are (un)installed
+_fontCache = {}
+# NSFont objects with features, variations and fallback font applied, see FormattedString._decoratedFont
+_decoratedFontCache = {}
+# for each NSFont a dict telling if a glyph has no outline, used by BezierPath.textBox
+_emptyGlyphCache = {}
+# laid out lines of BezierPath.textBox by (attributed string, box)
+_textFrameCache = OrderedDict()
+_textFrameCacheMaxSize = 64
+# CoreText and NSFont feature settings by frozen set of openTypeFeatures items
+_fontFeatureSettingsCache = {}
+# immutable paragraph styles by the paragraph attributes, see FormattedString.append
+_paragraphStyleCache = {}
+# NSColor objects for the text fill and stroke by (color class, color space, color values)
+_textColorCache = {}
+# font names that are not a font file path, by the name given by the user
+_fontNameCache = {}
+_fontFileExtensions = (".otf", ".ttf", ".ttc")
+_fontCacheMaxSize = 1024
+
+FontMetrics = namedtuple("FontMetrics", "ascender descender xHeight capHeight leading lineHeight")
+
+
+def _fontWithNameSize(fontName, fontSize):
+    key = fontName, fontSize
+    font = _fontCache.get(key)
+    if font is None:
+        font = AppKit.NSFont.fontWithName_size_(fontName, fontSize)
+        if font is not None:
+            if len(_fontCache) >= _fontCacheMaxSize:
+                _fontCache.clear()
+            _fontCache[key] = font
+    return font
+
+
 def _tryInstallFontFromFontName(fontName):
     from drawBot.drawBotDrawingTools import _drawBotDrawingTool
     return _drawBotDrawingTool._tryInstallFontFromFontName(fontName)
 
 
+def _resolveFontName(fontName):
+    # skip the file system check for names already seen in this session
+    resolved = _fontNameCache.get(fontName)
+    if resolved is None:
+        resolved = str(_tryInstallFontFromFontName(fontName))
+        # a font file path that does not exist yet could be there on the next call
+        isPath = os.sep in resolved or os.path.splitext(resolved)[1].lower() in _fontFileExtensions
+        if resolved == fontName and not isPath:
+            if len(_fontNameCache) >= _fontCacheMaxSize:
+                _fontNameCache.clear()
+            _fontNameCache[fontName] = resolved
+    return resolved
+
+
 # context specific attributes
 
 class ContextPropertyMixin:
@@ -363,6 +419,8 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
 
         Optionally `txt` can be a `FormattedString`.
         """
+        if isinstance(txt, bytes):
+            txt = txt.decode("utf-8")
         if not isinstance(txt, (str, FormattedString)):
             raise TypeError("expected 'str' or 'FormattedString', got '%s'" % type(txt).__name__)
         if align and align not in BaseContext._textAlignMap.keys():
@@ -393,6 +451,8 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         Optionally `txt` can be a `FormattedString`.
         Optionally `box` can be a `BezierPath`.
         """
+        if isinstance(txt, bytes):
+            txt = txt.decode("utf-8")
         if not isinstance(txt, (str, FormattedString)):
             raise TypeError("expected 'str' or 'FormattedString', got '%s'" % type(txt).__name__)
         if align and align not in BaseContext._textAlignMap.keys():
@@ -401,28 +461,61 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         context.font(font, fontSize)
         context.hyphenation(hyphenation)
 
-        path, (x, y) = context._getPathForFrameSetter(box)
         attributedString = context.attributedString(txt, align)
-
-        setter = CoreText.CTFramesetterCreateWithAttributedString(attributedString)
-        frame = CoreText.CTFramesetterCreateFrame(setter, (0, 0), path, None)
-        ctLines = CoreText.CTFrameGetLines(frame)
-        origins = CoreText.CTFrameGetLineOrigins(frame, (0, len(ctLines)), None)
-
-        for i, (originX, originY) in enumerate(origins):
-            ctLine = ctLines[i]
+        # only rectangular boxes are cached, a bezier path box can change
+        cacheKey = None
+        if isinstance(box, (tuple, list)):
+            # an immutable copy, compared with isEqual: on lookup
+            cacheKey = attributedString.copy(), tuple(box)
+        cached = None
+        if cacheKey is not None:
+            cached = _textFrameCache.pop(cacheKey, None)
+        if cached is None:
+            path, (x, y) = context._getPathForFrameSetter(box)
+            setter = CoreText.CTFramesetterCreateWithAttributedString(attributedString)
+            frame = CoreText.CTFramesetterCreateFrame(setter, (0, 0), path, None)
+            ctLines = CoreText.CTFrameGetLines(frame)
+            origins = CoreText.CTFrameGetLineOrigins(frame, (0, len(ctLines)), None)
+            cached = (x, y), ctLines, origins
+            if len(_textFrameCache) >= _textFrameCacheMaxSize:
+                _textFrameCache.popitem(last=False)
+        else:
+            (x, y), ctLines, origins = cached
+        if cacheKey is not None:
+            _textFrameCache[cacheKey] = cached
+
+        moveTo = self._path.moveToPoint_
+        appendGlyph = self._path.appendBezierPathWithGlyph_inFont_
+        getGlyphs = CoreText.CTRunGetGlyphs
+        getPositions = CoreText.CTRunGetPositions
+        for ctLine, (originX, originY) in zip(ctLines, origins):
+            lineX = x + originX
+            lineY = y + originY
             ctRuns = CoreText.CTLineGetGlyphRuns(ctLine)
             for ctRun in ctRuns:
                 attributes = CoreText.CTRunGetAttributes(ctRun)
                 font = attributes.get(AppKit.NSFontAttributeName)
                 baselineShift = attributes.get(AppKit.NSBaselineOffsetAttributeName, 0)
                 glyphCount = CoreText.CTRunGetGlyphCount(ctRun)
-                for i in range(glyphCount):
-                    glyph = CoreText.CTRunGetGlyphs(ctRun, (i, 1), None)[0]
-                    ax, ay = CoreText.CTRunGetPositions(ctRun, (i, 1), None)[0]
-                    if glyph:
-                        self._path.moveToPoint_((x + originX + ax, y + originY + ay + baselineShift))
-                        self._path.appendBezierPathWithGlyph_inFont_(glyph, font)
+                # get all glyphs and positions of the run at once
+                glyphs = getGlyphs(ctRun, (0, glyphCount), None)
+                positions = getPositions(ctRun, (0, glyphCount), None)
+                emptyGlyphs = _emptyGlyphCache.get(font)
+                if emptyGlyphs is None:
+                    if len(_emptyGlyphCache) >= _fontCacheMaxSize:
+                        _emptyGlyphCache.clear()
+                    emptyGlyphs = _emptyGlyphCache[font] = dict()
+                for glyph, (ax, ay) in zip(glyphs, positions):
+                    if not glyph:
+                        continue
+                    isEmpty = emptyGlyphs.get(glyph)
+                    if isEmpty is None:
+                        # glyphs without an outline, like a space, would only add a moveTo
+                        glyphPath = CoreText.CTFontCreatePathForGlyph(font, glyph, None)
+                        isEmpty = emptyGlyphs[glyph] = glyphPath is None or Quartz.CGPathIsEmpty(glyphPath)
+                    if not isEmpty:
+                        moveTo((lineX + ax, lineY + ay + baselineShift))
+                        appendGlyph(glyph, font)
         self.optimizePath()
         return context.clippedText(txt, box, align)
 
@@ -493,8 +586,15 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         """
         Check if a point `x`, `y` is inside a path.
         """
-        x, y = xy
-        return self._path.containsPoint_((x, y))
+        return self._path.containsPoint_(xy)
+
+    def pointsInside(self, points):
+        """
+        Check for a list of points `(x, y)` if they are inside the path.
+        Returns a list of booleans.
+        """
+        containsPoint = self._path.containsPoint_
+        return [containsPoint(xy) for xy in points]
 
     def bounds(self):
         """
@@ -516,18 +616,28 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         count = self._path.elementCount()
         if not count or self._path.elementAtIndex_(count - 1) != AppKit.NSMoveToBezierPathElement:
             return
+        # NSBezierPath can not drop its last element, rebuild the path without the trailing moveTo
         optimizedPath = AppKit.NSBezierPath.alloc().init()
+        elementAtIndex = self._path.elementAtIndex_associatedPoints_
+        moveTo = optimizedPath.moveToPoint_
+        lineTo = optimizedPath.lineToPoint_
+        curveTo = optimizedPath.curveToPoint_controlPoint1_controlPoint2_
+        closePath = optimizedPath.closePath
+        moveToElement = AppKit.NSMoveToBezierPathElement
+        lineToElement = AppKit.NSLineToBezierPathElement
+        curveToElement = AppKit.NSCurveToBezierPathElement
+        closePathElement = AppKit.NSClosePathBezierPathElement
         for i in range(count - 1):
-            instruction, points = self._path.elementAtIndex_associatedPoints_(i)
-            if instruction == AppKit.NSMoveToBezierPathElement:
-                optimizedPath.moveToPoint_(*points)
-            elif instruction == AppKit.NSLineToBezierPathElement:
-                optimizedPath.lineToPoint_(*points)
-            elif instruction == AppKit.NSCurveToBezierPathElement:
+            instruction, points = elementAtIndex(i)
+            if instruction == curveToElement:
                 p1, p2, p3 = points
-                optimizedPath.curveToPoint_controlPoint1_controlPoint2_(p3, p1, p2)
-            elif instruction == AppKit.NSClosePathBezierPathElement:
-                optimizedPath.closePath()
+                curveTo(p3, p1, p2)
+            elif instruction == lineToElement:
+                lineTo(*points)
+            elif instruction == moveToElement:
+                moveTo(*points)
+            elif instruction == closePathElement:
+                closePath()
         self._path = optimizedPath
 
     def copy(self):
@@ -758,13 +868,20 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         points = []
         if not onCurve and not offCurve:
             return points
+        appendPoint = points.append
+        elementAtIndex = self._path.elementAtIndex_associatedPoints_
         for index in range(self._path.elementCount()):
-            instruction, pts = self._path.elementAtIndex_associatedPoints_(index)
-            if not onCurve:
-                pts = pts[:-1]
-            elif not offCurve:
-                pts = pts[-1:]
-            points.extend([(p.x, p.y) for p in pts])
+            instruction, pts = elementAtIndex(index)
+            if not pts:
+                # closePath has no points
+                continue
+            count = len(pts)
+            # the last point of an element is the on curve point
+            start = 0 if offCurve else count - 1
+            stop = count if onCurve else count - 1
+            for i in range(start, stop):
+                p = pts[i]
+                appendPoint((p.x, p.y))
         return tuple(points)
 
     def _get_points(self):
@@ -784,15 +901,22 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
 
     def _get_contours(self):
         contours = []
+        contourClass = self.contourClass
+        elementAtIndex = self._path.elementAtIndex_associatedPoints_
+        moveToElement = AppKit.NSMoveToBezierPathElement
+        closePathElement = AppKit.NSClosePathBezierPathElement
+        contour = None
         for index in range(self._path.elementCount()):
-            instruction, pts = self._path.elementAtIndex_associatedPoints_(index)
-            if instruction == AppKit.NSMoveToBezierPathElement:
-                contours.append(self.contourClass())
-            if instruction == AppKit.NSClosePathBezierPathElement:
-                contours[-1].open = False
+            instruction, pts = elementAtIndex(index)
+            if instruction == moveToElement:
+                contour = contourClass()
+                contours.append(contour)
+            if instruction == closePathElement:
+                contour.open = False
             if pts:
-                contours[-1].append([(p.x, p.y) for p in pts])
-        if len(contours) >= 2 and len(contours[-1]) == 1 and contours[-1][0] == contours[-2][0]:
+                contour.append([(p.x, p.y) for p in pts])
+        # list equality bails out on a length mismatch, the segments hold at most three points
+        if len(contours) >= 2 and len(contour) == 1 and contour[0] == contours[-2][0]:
             contours.pop()
         return tuple(contours)
 
@@ -842,20 +966,19 @@ class Color(object):
         return self._color
 
     def copy(self):
-        new = self.__class__()
-        new._color = self._color.copy()
-        return new
+        # a color is never changed after it is created, it can be shared
+        return self
 
     @classmethod
     def getColorsFromList(cls, inputColors):
-        outputColors = []
-        for color in inputColors:
-            color = cls.getColor(color)
-            outputColors.append(color)
-        return outputColors
+        getColor = cls.getColor
+        return [getColor(color) for color in inputColors]
 
     @classmethod
     def getColor(cls, color):
+        # plain tuples and lists are by far the most common input
+        if type(color) in (tuple, list):
+            return cls(*color)
         if isinstance(color, cls.__class__):
             return color
         elif isinstance(color, (tuple, list)):
@@ -893,14 +1016,8 @@ class Shadow(object):
         self.cmykColor = None
 
     def copy(self):
-        new = self.__class__()
-        new.offset = self.offset
-        new.blur = self.blur
-        new.color = self.color.copy()
-        new.cmykColor = None
-        if self.cmykColor:
-            new.cmykColor = self.cmykColor.copy()
-        return new
+        # a shadow is never changed once it is set in the graphics state, it can be shared
+        return self
 
 
 class Gradient(object):
@@ -915,7 +1032,8 @@ class Gradient(object):
         if not colors or len(colors) < 2:
             raise DrawBotError("Gradient needs at least 2 colors")
         if positions is None:
-            positions = [i / float(len(colors) - 1) for i in range(len(colors))]
+            last = float(len(colors) - 1)
+            positions = [i / last for i in range(len(colors))]
         if len(colors) != len(positions):
             raise DrawBotError("Gradient needs a correct position for each color")
         self.gradientType = gradientType
@@ -928,18 +1046,8 @@ class Gradient(object):
         self.endRadius = endRadius
 
     def copy(self):
-        new = self.__class__()
-        new.gradientType = self.gradientType
-        new.colors = [color.copy() for color in self.colors]
-        new.cmykColors = None
-        if self.cmykColors:
-            new.cmykColors = [color.copy() for color in self.cmykColors]
-        new.positions = list(self.positions)
-        new.start = self.start
-        new.end = self.end
-        new.startRadius = self.startRadius
-        new.endRadius = self.endRadius
-        return new
+        # a gradient is never changed once it is set in the graphics state, it can be shared
+        return self
 
 
 def makeTextBoxes(attributedString, xy, align, plainText):
@@ -1088,6 +1196,11 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
     )
 
     def __init__(self, txt=None, **kwargs):
+        self._resolvedFont = None
+        self._paraKey = None
+        self._paraStyle = None
+        self._featuresKey = None
+        self._featureSettings = None
         self.clear()
         # create all _<attributes> in the formatted text object
         # with default values
@@ -1160,6 +1273,110 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
     def clear(self):
         self._attributedString = AppKit.NSMutableAttributedString.alloc().init()
 
+    def _fontFeatureSettings(self):
+        # the feature settings only depend on the openTypeFeatures, keep the last ones around
+        featuresKey = frozenset(self._openTypeFeatures.items())
+        if featuresKey != self._featuresKey:
+            # the same feature settings are shared by all formatted strings
+            featureSettings = _fontFeatureSettingsCache.get(featuresKey)
+            if featureSettings is None:
+                coreTextFontFeatures = []
+                nsFontFeatures = []  # fallback for macOS < 10.13, only filled in when required
+                # sort features by their on/off state
+                # set all disabled features first
+                orderedOpenTypeFeatures = sorted(self._openTypeFeatures.items(), key=lambda kv: kv[1])
+                featureMap = SFNTLayoutTypes.featureMap
+                featureMapOff = SFNTLayoutTypes.featureMapOff
+                for featureTag, value in orderedOpenTypeFeatures:
+                    feature = dict(CTFeatureOpenTypeTag=featureTag, CTFeatureOpenTypeValue=value)
+                    coreTextFontFeatures.append(feature)
+                    if not _useNSFontFeatures:
+                        continue
+                    # The next lines are a fallback for macOS < 10.13
+                    if value:
+                        feature = featureMap.get(featureTag)
+                    else:
+                        feature = featureMapOff.get(featureTag)
+                    if feature is not None:
+                        nsFontFeatures.append(feature)
+                featureSettings = tuple(coreTextFontFeatures), tuple(nsFontFeatures)
+                if len(_fontFeatureSettingsCache) >= _fontCacheMaxSize:
+                    _fontFeatureSettingsCache.clear()
+                _fontFeatureSettingsCache[featuresKey] = featureSettings
+            self._featuresKey = featuresKey
+            self._featureSettings = featureSettings
+        return self._featureSettings
+
+    def _decoratedFont(self):
+        # return the font with all features, variations and the fallback font applied
+        # and the warnings that came up while building it, the result is cached
+        key = (
+            self._font, self._fontSize, self._fallbackFont,
+            frozenset(self._openTypeFeatures.items()), frozenset(self._fontVariations.items())
+        )
+        cached = _decoratedFontCache.get(key)
+        if cached is not None:
+            return cached
+        fontWarnings = []
+        font = _fontWithNameSize(self._font, self._fontSize)
+        if font is None:
+            ff = self._fallbackFont
+            if ff is None:
+                ff = _FALLBACKFONT
+            fontWarnings.append("font: '%s' is not installed, back to the fallback font: '%s'" % (self._font, ff))
+            font = _fontWithNameSize(ff, self._fontSize)
+        coreTextFontFeatures, nsFontFeatures = self._fontFeatureSettings()
+        if self._openTypeFeatures:
+            # get existing openTypeFeatures for the font
+            existingOpenTypeFeatures = openType.getFeatureTagsForFontName(self._font)
+            for featureTag, value in self._openTypeFeatures.items():
+                if value and featureTag not in existingOpenTypeFeatures:
+                    # only warn when the feature is on and not existing for the current font
+                    fontWarnings.append("OpenType feature '%s' not available for '%s'" % (featureTag, self._font))
+
+        coreTextFontVariations = dict()
+        if self._fontVariations:
+            existingAxes = variation.getVariationAxesForFontName(self._font)
+            for axis, value in self._fontVariations.items():
+                if axis in existingAxes:
+                    existinsAxis = existingAxes[axis]
+                    # clip variation value within the min max value
+                    if value < existinsAxis["minValue"]:
+                        value = existinsAxis["minValue"]
+                    if value > existinsAxis["maxValue"]:
+                        value = existinsAxis["maxValue"]
+                    coreTextFontVariations[variation.convertVariationTagToInt(axis)] = value
+                else:
+                    fontWarnings.append("variation axis '%s' not available for '%s'" % (axis, self._font))
+        fontAttributes = {}
+        if coreTextFontFeatures:
+            fontAttributes[CoreText.kCTFontFeatureSettingsAttribute] = coreTextFontFeatures
+            if _useNSFontFeatures:
+                # fallback for macOS < 10.13:
+                fontAttributes[CoreText.NSFontFeatureSettingsAttribute] = nsFontFeatures
+        if coreTextFontVariations:
+            fontAttributes[CoreText.NSFontVariationAttribute] = coreTextFontVariations
+        if self._fallbackFont:
+            fontAttributes[CoreText.NSFontCascadeListAttribute] = [AppKit.NSFontDescriptor.fontDescriptorWithName_size_(self._fallbackFont, self._fontSize)]
+        fontDescriptor = font.fontDescriptor()
+        fontDescriptor = fontDescriptor.fontDescriptorByAddingAttributes_(fontAttributes)
+        font = AppKit.NSFont.fontWithDescriptor_size_(fontDescriptor, self._fontSize)
+        if len(_decoratedFontCache) >= _fontCacheMaxSize:
+            _decoratedFontCache.clear()
+        _decoratedFontCache[key] = font, fontWarnings
+        return font, fontWarnings
+
+    def _textColor(self, colorClass, color):
+        # most text is set in a handful of colors, keep the converted NSColor objects around
+        key = colorClass, colorClass.colorSpace, tuple(color)
+        nsColor = _textColorCache.get(key)
+        if nsColor is None:
+            nsColor = colorClass.getColor(color).getNSObject()
+            if len(_textColorCache) >= _fontCacheMaxSize:
+                _textColorCache.clear()
+            _textColorCache[key] = nsColor
+        return nsColor
+
     def append(self, txt, **kwargs):
         """
         Add `txt` to the formatted string with some additional text formatting attributes:
@@ -1191,11 +1408,17 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
 
         Text can also be added with `formattedString += "hello"`. It will append the text with the current settings of the formatted string.
         """
-        attributes = self._validateAttributes(kwargs, addDefaults=False)
-        for key, value in attributes.items():
-            self._setAttribute(key, value)
+        if kwargs:
+            attributes = self._validateAttributes(kwargs, addDefaults=False)
+            for key, value in attributes.items():
+                self._setAttribute(key, value)
+        else:
+            # nothing to validate when appending with the current settings, like `+=`
+            attributes = kwargs
         self._setColorAttributes(attributes)
 
+        if isinstance(txt, bytes):
+            txt = txt.decode("utf-8")
         if isinstance(txt, FormattedString):
             self._attributedString.appendAttributedString_(txt.getNSObject())
             return
@@ -1203,78 +1426,26 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
             raise TypeError("expected 'unicode' or 'FormattedString', got '%s'" % type(txt).__name__)
         attributes = {}
         if self._font:
-            font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
-            if font is None:
-                ff = self._fallbackFont
-                if ff is None:
-                    ff = _FALLBACKFONT
-                warnings.warn("font: '%s' is not installed, back to the fallback font: '%s'" % (self._font, ff))
-                font = AppKit.NSFont.fontWithName_size_(ff, self._fontSize)
-            coreTextFontFeatures = []
-            nsFontFeatures = []  # fallback for macOS < 10.13
+            font, fontWarnings = self._decoratedFont()
+            for message in fontWarnings:
+                warnings.warn(message)
             if self._openTypeFeatures:
                 # store openTypeFeatures in a custom attributes key
-                attributes["drawbot.openTypeFeatures"] = dict(self._openTypeFeatures)
-                # get existing openTypeFeatures for the font
-                existingOpenTypeFeatures = openType.getFeatureTagsForFontName(self._font)
-                # sort features by their on/off state
-                # set all disabled features first
-                orderedOpenTypeFeatures = sorted(self._openTypeFeatures.items(), key=lambda kv: kv[1])
-                for featureTag, value in orderedOpenTypeFeatures:
-                    if value and featureTag not in existingOpenTypeFeatures:
-                        # only warn when the feature is on and not existing for the current font
-                        warnings.warn("OpenType feature '%s' not available for '%s'" % (featureTag, self._font))
-                    feature = dict(CTFeatureOpenTypeTag=featureTag, CTFeatureOpenTypeValue=value)
-                    coreTextFontFeatures.append(feature)
-                    # The next lines are a fallback for macOS < 10.13
-                    nsFontFeatureTag = featureTag
-                    if not value:
-                        nsFontFeatureTag = "%s_off" % featureTag
-                    if nsFontFeatureTag in SFNTLayoutTypes.featureMap:
-                        feature = SFNTLayoutTypes.featureMap[nsFontFeatureTag]
-                        nsFontFeatures.append(feature)
-                    # kern is a special case
-                    if featureTag == "kern" and not value:
-                        # https://developer.apple.com/documentation/uikit/nskernattributename
-                        # The value 0 means kerning is disabled.
-                        attributes[AppKit.NSKernAttributeName] = 0
-
-            coreTextFontVariations = dict()
-            if self._fontVariations:
-                existingAxes = variation.getVariationAxesForFontName(self._font)
-                for axis, value in self._fontVariations.items():
-                    if axis in existingAxes:
-                        existinsAxis = existingAxes[axis]
-                        # clip variation value within the min max value
-                        if value < existinsAxis["minValue"]:
-                            value = existinsAxis["minValue"]
-                        if value > existinsAxis["maxValue"]:
-                            value = existinsAxis["maxValue"]
-                        coreTextFontVariations[variation.convertVariationTagToInt(axis)] = value
-                    else:
-                        warnings.warn("variation axis '%s' not available for '%s'" % (axis, self._font))
-            fontAttributes = {}
-            if coreTextFontFeatures:
-                fontAttributes[CoreText.kCTFontFeatureSettingsAttribute] = coreTextFontFeatures
-                if macOSVersion < "10.13":
-                    # fallback for macOS < 10.13:
-                    fontAttributes[CoreText.NSFontFeatureSettingsAttribute] = nsFontFeatures
-            if coreTextFontVariations:
-                fontAttributes[CoreText.NSFontVariationAttribute] = coreTextFontVariations
-            if self._fallbackFont:
-                fontAttributes[CoreText.NSFontCascadeListAttribute] = [AppKit.NSFontDescriptor.fontDescriptorWithName_size_(self._fallbackFont, self._fontSize)]
-            fontDescriptor = font.fontDescriptor()
-            fontDescriptor = fontDescriptor.fontDescriptorByAddingAttributes_(fontAttributes)
-            font = AppKit.NSFont.fontWithDescriptor_size_(fontDescriptor, self._fontSize)
+                attributes["drawbot.openTypeFeatures"] = self._openTypeFeatures
+                # kern is a special case
+                if "kern" in self._openTypeFeatures and not self._openTypeFeatures["kern"]:
+                    # https://developer.apple.com/documentation/uikit/nskernattributename
+                    # The value 0 means kerning is disabled.
+                    attributes[AppKit.NSKernAttributeName] = 0
             attributes[AppKit.NSFontAttributeName] = font
         elif self._fontSize:
-            font = AppKit.NSFont.fontWithName_size_(_FALLBACKFONT, self._fontSize)
+            font = _fontWithNameSize(_FALLBACKFONT, self._fontSize)
             attributes[AppKit.NSFontAttributeName] = font
         if self._fill or self._cmykFill:
             if self._fill:
-                fillColor = self._colorClass.getColor(self._fill).getNSObject()
+                fillColor = self._textColor(self._colorClass, self._fill)
             elif self._cmykFill:
-                fillColor = self._cmykColorClass.getColor(self._cmykFill).getNSObject()
+                fillColor = self._textColor(self._cmykColorClass, self._cmykFill)
             attributes[AppKit.NSForegroundColorAttributeName] = fillColor
         else:
             # seems like the default foreground color is black
@@ -1282,9 +1453,9 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
             attributes[AppKit.NSForegroundColorAttributeName] = AppKit.NSColor.clearColor()
         if self._stroke or self._cmykStroke:
             if self._stroke:
-                strokeColor = self._colorClass.getColor(self._stroke).getNSObject()
+                strokeColor = self._textColor(self._colorClass, self._stroke)
             elif self._cmykStroke:
-                strokeColor = self._cmykColorClass.getColor(self._cmykStroke).getNSObject()
+                strokeColor = self._textColor(self._cmykColorClass, self._cmykStroke)
             attributes[AppKit.NSStrokeColorAttributeName] = strokeColor
             # stroke width must be negative
             # Supply a negative value for NSStrokeWidthAttributeName
@@ -1294,52 +1465,69 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
             # at 100 points. Our value should not scale with the font size, so we
             # compensate by multiplying by 100 and dividing by the font size.
             attributes[AppKit.NSStrokeWidthAttributeName] = -abs(100 * self._strokeWidth / self._fontSize)
-        para = AppKit.NSMutableParagraphStyle.alloc().init()
-        if self._align:
-            para.setAlignment_(self._textAlignMap[self._align])
-        if self._tabs:
-            for tabStop in para.tabStops():
-                para.removeTabStop_(tabStop)
-
-            if len(self._tabs) < 12:
-                self._tabs = list(self._tabs)
-                # add tab stops if there is not enough stops...
-                # the default is 12 tabs, so lets add 12 in steps of 28
-                lastTabValue = self._tabs[-1][0]
-                for tabIndex in range(12 - len(self._tabs)):
-                    self._tabs.append((lastTabValue + 28 * (tabIndex + 1), "left"))
-
-            for tab, tabAlign in self._tabs:
-                tabOptions = None
-                if tabAlign in self._textTabAlignMap:
-                    tabAlign = self._textTabAlignMap[tabAlign]
-                else:
-                    tabCharSet = AppKit.NSCharacterSet.characterSetWithCharactersInString_(tabAlign)
-                    tabOptions = {AppKit.NSTabColumnTerminatorsAttributeName: tabCharSet}
-                    tabAlign = self._textAlignMap["right"]
-                tabStop = AppKit.NSTextTab.alloc().initWithTextAlignment_location_options_(tabAlign, tab, tabOptions)
-                para.addTabStop_(tabStop)
-        if self._lineHeight is not None:
-            # para.setLineSpacing_(0.0)
-            # para.setLineHeightMultiple_(1)
-            para.setMinimumLineHeight_(self._lineHeight)
-            para.setMaximumLineHeight_(self._lineHeight)
-
-        if self._indent is not None:
-            para.setHeadIndent_(self._indent)
-            para.setFirstLineHeadIndent_(self._indent)
-        if self._tailIndent is not None:
-            para.setTailIndent_(self._tailIndent)
-        if self._firstLineIndent is not None:
-            para.setFirstLineHeadIndent_(self._firstLineIndent)
-
-        if self._paragraphTopSpacing is not None:
-            para.setParagraphSpacingBefore_(self._paragraphTopSpacing)
-        if self._paragraphBottomSpacing is not None:
-            para.setParagraphSpacing_(self._paragraphBottomSpacing)
+        if self._tabs and len(self._tabs) < 12:
+            self._tabs = list(self._tabs)
+            # add tab stops if there is not enough stops...
+            # the default is 12 tabs, so lets add 12 in steps of 28
+            lastTabValue = self._tabs[-1][0]
+            for tabIndex in range(12 - len(self._tabs)):
+                self._tabs.append((lastTabValue + 28 * (tabIndex + 1), "left"))
+        # reuse the paragraph style of the previous append when nothing changed
+        paraKey = (
+            self._align, self._tabs and tuple(tuple(tab) for tab in self._tabs), self._lineHeight,
+            self._indent, self._tailIndent, self._firstLineIndent,
+            self._paragraphTopSpacing, self._paragraphBottomSpacing
+        )
+        if paraKey == self._paraKey:
+            para = self._paraStyle
+        else:
+            # paragraph styles with the same settings are shared by all formatted strings
+            para = _paragraphStyleCache.get(paraKey)
+        if para is None:
+            para = AppKit.NSMutableParagraphStyle.alloc().init()
+            if self._align:
+                para.setAlignment_(self._textAlignMap[self._align])
+            if self._tabs:
+                for tabStop in para.tabStops():
+                    para.removeTabStop_(tabStop)
+                for tab, tabAlign in self._tabs:
+                    tabOptions = None
+                    if tabAlign in self._textTabAlignMap:
+                        tabAlign = self._textTabAlignMap[tabAlign]
+                    else:
+                        tabCharSet = AppKit.NSCharacterSet.characterSetWithCharactersInString_(tabAlign)
+                        tabOptions = {AppKit.NSTabColumnTerminatorsAttributeName: tabCharSet}
+                        tabAlign = self._textAlignMap["right"]
+                    tabStop = AppKit.NSTextTab.alloc().initWithTextAlignment_location_options_(tabAlign, tab, tabOptions)
+                    para.addTabStop_(tabStop)
+            if self._lineHeight is not None:
+                # para.setLineSpacing_(0.0)
+                # para.setLineHeightMultiple_(1)
+                para.setMinimumLineHeight_(self._lineHeight)
+                para.setMaximumLineHeight_(self._lineHeight)
+
+            if self._indent is not None:
+                para.setHeadIndent_(self._indent)
+                para.setFirstLineHeadIndent_(self._indent)
+            if self._tailIndent is not None:
+                para.setTailIndent_(self._tailIndent)
+            if self._firstLineIndent is not None:
+                para.setFirstLineHeadIndent_(self._firstLineIndent)
+
+            if self._paragraphTopSpacing is not None:
+                para.setParagraphSpacingBefore_(self._paragraphTopSpacing)
+            if self._paragraphBottomSpacing is not None:
+                para.setParagraphSpacing_(self._paragraphBottomSpacing)
+            # an immutable copy is safe to share between attributed strings
+            para = para.copy()
+            if len(_paragraphStyleCache) >= _fontCacheMaxSize:
+                _paragraphStyleCache.clear()
+            _paragraphStyleCache[paraKey] = para
+        self._paraKey = paraKey
+        self._paraStyle = para
 
         if self._tracking is not None:
-            if macOSVersion < "10.12":
+            if _useKernForTracking:
                 attributes[AppKit.NSKernAttributeName] = self._tracking
             else:
                 attributes[CoreText.kCTTrackingAttributeName] = self._tracking
@@ -1365,6 +1553,15 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
             new.append(txt)
         return new
 
+    def __iadd__(self, txt):
+        if isinstance(txt, self.__class__):
+            self._attributedString.appendAttributedString_(txt.getNSObject())
+        else:
+            if not isinstance(txt, unicode):
+                raise TypeError("FormattedString requires a str or unicode, got '%s'" % type(txt))
+            self.append(txt)
+        return self
+
     def __getitem__(self, index):
         if isinstance(index, slice):
             start = index.start
@@ -1427,11 +1624,11 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         The font name is returned, which is handy when the font was loaded
         from a path.
         """
-        font = _tryInstallFontFromFontName(font)
-        font = str(font)
+        font = _resolveFontName(font)
         self._font = font
         if fontSize is not None:
             self._fontSize = fontSize
+        self._resolvedFont = None
         return font
 
     def fallbackFont(self, font):
@@ -1440,9 +1637,8 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         If a font path is given the font will be installed and used directly.
         """
         if font:
-            font = _tryInstallFontFromFontName(font)
-            font = str(font)
-            testFont = AppKit.NSFont.fontWithName_size_(font, self._fontSize)
+            font = _resolveFontName(font)
+            testFont = _fontWithNameSize(font, self._fontSize)
             if testFont is None:
                 raise DrawBotError("Fallback font '%s' is not available" % font)
         self._fallbackFont = font
@@ -1454,6 +1650,7 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         The default `fontSize` is 10pt.
         """
         self._fontSize = fontSize
+        self._resolvedFont = None
 
     def fill(self, *fill):
         """
@@ -1575,11 +1772,15 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
             if args[0] is not None:
                 raise DrawBotError("First positional argument can only be None")
             warnings.warn("openTypeFeatures(None) is deprecated, use openTypeFeatures(resetFeatures=True) instead.")
-            self._openTypeFeatures.clear()
+            self._openTypeFeatures = dict()
         else:
+            # never change the features dict in place, it can be shared with attributed strings
             if features.pop("resetFeatures", False):
-                self._openTypeFeatures.clear()
-            self._openTypeFeatures.update(features)
+                openTypeFeatures = dict()
+            else:
+                openTypeFeatures = dict(self._openTypeFeatures)
+            openTypeFeatures.update(features)
+            self._openTypeFeatures = openTypeFeatures
         return dict(self._openTypeFeatures)
 
     def listOpenTypeFeatures(self, fontName=None):
@@ -1608,11 +1809,14 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
             if args[0] is not None:
                 raise DrawBotError("First positional argument can only be None")
             warnings.warn("fontVariations(None) is deprecated, use fontVariations(resetVariations=True) instead.")
-            self._fontVariations.clear()
+            self._fontVariations = dict()
         else:
             if axes.pop("resetVariations", False):
-                self._fontVariations.clear()
-            self._fontVariations.update(axes)
+                fontVariations = dict()
+            else:
+                fontVariations = dict(self._fontVariations)
+            fontVariations.update(axes)
+            self._fontVariations = fontVariations
         defaultVariations = self.listFontVariations()
         currentVariation = {axis: data["defaultValue"] for axis, data in defaultVariations.items()}
         currentVariation.update(self._fontVariations)
@@ -1791,10 +1995,15 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         """
         Copy the formatted string.
         """
-        attributes = {key: getattr(self, "_%s" % key) for key in self._formattedAttributes}
-        new = self.__class__(**attributes)
+        # all attributes are already validated, copy them without calling each setter again
+        new = self.__class__.__new__(self.__class__)
+        for key, value in self.__dict__.items():
+            if isinstance(value, dict):
+                value = dict(value)
+            elif isinstance(value, list):
+                value = list(value)
+            new.__dict__[key] = value
         new._attributedString = self._attributedString.mutableCopy()
-        new.copyContextProperties(self)
         return new
 
     def fontContainsCharacters(self, characters):
@@ -1802,14 +2011,14 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         Return a bool if the current font contains the provided `characters`.
         Characters is a string containing one or more characters.
         """
-        font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
+        font = _fontWithNameSize(self._font, self._fontSize)
         if font is None:
             return False
         result, glyphs = CoreText.CTFontGetGlyphsForCharacters(font, characters, None, len(characters))
         return result
 
     def fontContainsGlyph(self, glyphName):
-        font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
+        font = _fontWithNameSize(self._font, self._fontSize)
         if font is None:
             return False
         glyph = font.glyphWithName_(glyphName)
@@ -1819,7 +2028,7 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         """
         Return the path to the file of the current font.
         """
-        font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
+        font = _fontWithNameSize(self._font, self._fontSize)
         if font is not None:
             url = CoreText.CTFontDescriptorCopyAttribute(font.fontDescriptor(), CoreText.kCTFontURLAttribute)
             if url:
@@ -1887,60 +2096,47 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
             glyphNames.remove(".notdef")
         return glyphNames
 
+    def _resolveFont(self):
+        font = self._resolvedFont
+        if font is None:
+            font = _fontWithNameSize(self._font, self._fontSize)
+            if font is None:
+                # not kept on the instance, the warning is emitted on every call
+                ff = self._fallbackFont or _FALLBACKFONT
+                warnings.warn("font: '%s' is not installed, back to the fallback font: '%s'" % (self._font, ff))
+                return _fontWithNameSize(ff, self._fontSize)
+            self._resolvedFont = font
+        return font
+
     def fontAscender(self):
         """
         Returns the current font ascender, based on the current `font` and `fontSize`.
         """
-        font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
-        if font is None:
-            ff = self._fallbackFont or _FALLBACKFONT
-            warnings.warn("font: '%s' is not installed, back to the fallback font: '%s'" % (self._font, ff))
-            font = AppKit.NSFont.fontWithName_size_(ff, self._fontSize)
-        return font.ascender()
+        return self._resolveFont().ascender()
 
     def fontDescender(self):
         """
         Returns the current font descender, based on the current `font` and `fontSize`.
         """
-        font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
-        if font is None:
-            ff = self._fallbackFont or _FALLBACKFONT
-            warnings.warn("font: '%s' is not installed, back to the fallback font: '%s'" % (self._font, ff))
-            font = AppKit.NSFont.fontWithName_size_(ff, self._fontSize)
-        return font.descender()
+        return self._resolveFont().descender()
 
     def fontXHeight(self):
         """
         Returns the current font x-height, based on the current `font` and `fontSize`.
         """
-        font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
-        if font is None:
-            ff = self._fallbackFont or _FALLBACKFONT
-            warnings.warn("font: '%s' is not installed, back to the fallback font: '%s'" % (self._font, ff))
-            font = AppKit.NSFont.fontWithName_size_(ff, self._fontSize)
-        return font.xHeight()
+        return self._resolveFont().xHeight()
 
     def fontCapHeight(self):
         """
         Returns the current font cap height, based on the current `font` and `fontSize`.
         """
-        font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
-        if font is None:
-            ff = self._fallbackFont or _FALLBACKFONT
-            warnings.warn("font: '%s' is not installed, back to the fallback font: '%s'" % (self._font, ff))
-            font = AppKit.NSFont.fontWithName_size_(ff, self._fontSize)
-        return font.capHeight()
+        return self._resolveFont().capHeight()
 
     def fontLeading(self):
         """
         Returns the current font leading, based on the current `font` and `fontSize`.
         """
-        font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
-        if font is None:
-            ff = self._fallbackFont or _FALLBACKFONT
-            warnings.warn("font: '%s' is not installed, back to the fallback font: '%s'" % (self._font, ff))
-            font = AppKit.NSFont.fontWithName_size_(ff, self._fontSize)
-        return font.leading()
+        return self._resolveFont().leading()
 
     def fontLineHeight(self):
         """
@@ -1949,12 +2145,19 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         """
         if self._lineHeight is not None:
             return self._lineHeight
-        font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
-        if font is None:
-            ff = self._fallbackFont or _FALLBACKFONT
-            warnings.warn("font: '%s' is not installed, back to the fallback font: '%s'" % (self._font, ff))
-            font = AppKit.NSFont.fontWithName_size_(ff, self._fontSize)
-        return font.defaultLineHeightForFont()
+        return self._resolveFont().defaultLineHeightForFont()
+
+    def fontMetrics(self):
+        """
+        Returns all font metrics at once as a named tuple: `ascender`, `descender`, `xHeight`,
+        `capHeight`, `leading` and `lineHeight`, based on the current `font` and `fontSize`.
+        If a `lineHeight` is set, this value will be returned as `lineHeight`.
+        """
+        font = self._resolveFont()
+        lineHeight = self._lineHeight
+        if lineHeight is None:
+            lineHeight = font.defaultLineHeightForFont()
+        return FontMetrics(font.ascender(), font.descender(), font.xHeight(), font.capHeight(), font.leading(), lineHeight)
 
     def appendGlyph(self, *glyphNames):
         """
@@ -1979,10 +2182,10 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         baseString = chr(0xFFFD)
         font = None
         if self._font:
-            font = AppKit.NSFont.fontWithName_size_(self._font, self._fontSize)
+            font = _fontWithNameSize(self._font, self._fontSize)
         if font is None:
             warnings.warn("font: '%s' is not installed, back to the fallback font: '%s'" % (self._font, _FALLBACKFONT))
-            font = AppKit.NSFont.fontWithName_size_(_FALLBACKFONT, self._fontSize)
+            font = _fontWithNameSize(_FALLBACKFONT, self._fontSize)
 
         # disable calt features, as this seems to be on by default
         # for both the font stored in the nsGlyphInfo as in the replacement character
@@ -2030,35 +2233,18 @@ class GraphicsState(object):
         self.text = self._textClass()
         self.hyphenation = None
         self.path = None
+        self.attributedStringKey = None
 
     def copy(self):
-        new = self.__class__()
-        new.colorSpace = self.colorSpace
-        new.blendMode = self.blendMode
-        if self.fillColor is not None:
-            new.fillColor = self.fillColor.copy()
-        else:
-            new.fillColor = None
-        if self.strokeColor:
-            new.strokeColor = self.strokeColor.copy()
-        if self.cmykFillColor:
-            new.cmykFillColor = self.cmykFillColor.copy()
-        if self.cmykStrokeColor:
-            new.cmykStrokeColor = self.cmykStrokeColor.copy()
-        if self.shadow:
-            new.shadow = self.shadow.copy()
-        if self.gradient:
-            new.gradient = self.gradient.copy()
+        # skip __init__, it would build a color and a formatted string only to replace them
+        new = self.__class__.__new__(self.__class__)
+        # colors, shadow and gradient are never changed in place, they are shared
+        new.__dict__.update(self.__dict__)
         if self.path is not None:
             new.path = self.path.copy()
         new.text = self.text.copy()
-        new.hyphenation = self.hyphenation
-        new.strokeWidth = self.strokeWidth
-        new.lineCap = self.lineCap
         if self.lineDash is not None:
             new.lineDash = list(self.lineDash)
-        new.lineJoin = self.lineJoin
-        new.miterLimit = self.miterLimit
         return new
 
     def update(self, context):
@@ -2195,6 +2381,7 @@ class BaseContext(object):
     def reset(self):
         self._stack = []
         self._state = self._graphicsStateClass()
+        self._shapePath = None
         self._colorClass.colorSpace = self._colorSpaceMap['genericRGB']
         self._reset()
 
@@ -2234,13 +2421,23 @@ class BaseContext(object):
         self._state.update(self)
         self._restore()
 
+    def _getShapePath(self):
+        # rect and oval draw their path right away and a saved state holds a copy,
+        # so one path object can be emptied and reused for every shape
+        path = self._shapePath
+        if path is None:
+            path = self._shapePath = self._bezierPathClass()
+        else:
+            path._path.removeAllPoints()
+        return path
+
     def rect(self, x, y, w, h):
-        path = self._bezierPathClass()
+        path = self._getShapePath()
         path.rect(x, y, w, h)
         self.drawPath(path)
 
     def oval(self, x, y, w, h):
-        path = self._bezierPathClass()
+        path = self._getShapePath()
         path.oval(x, y, w, h)
         self.drawPath(path)
 
@@ -2388,16 +2585,20 @@ class BaseContext(object):
     def lineJoin(self, join):
         if join is None:
             self._state.lineJoin = None
-        if join not in _LINEJOINSTYLESMAP:
+            return
+        value = _LINEJOINSTYLESMAP.get(join)
+        if value is None:
             raise DrawBotError("lineJoin() argument must be 'bevel', 'miter' or 'round'")
-        self._state.lineJoin = _LINEJOINSTYLESMAP[join]
+        self._state.lineJoin = value
 
     def lineCap(self, cap):
         if cap is None:
             self._state.lineCap = None
-        if cap not in _LINECAPSTYLESMAP:
+            return
+        value = _LINECAPSTYLESMAP.get(cap)
+        if value is None:
             raise DrawBotError("lineCap() argument must be 'butt', 'square' or 'round'")
-        self._state.lineCap = _LINECAPSTYLESMAP[cap]
+        self._state.lineCap = value
 
     def lineDash(self, dash):
         if dash[0] is None:
@@ -2450,11 +2651,33 @@ class BaseContext(object):
     def attributedString(self, txt, align=None):
         if isinstance(txt, FormattedString):
             return txt.getNSObject()
-        self._state.text.clear()
-        self._state.text.append(txt, align=align)
-        return self._state.text.getNSObject()
+        text = self._state.text
+        # reuse the attributed string when the same text is set with unchanged formatting,
+        # the colors are built in the current color space
+        colorSpace = self._state.colorSpace
+        formatting = self._textFormatting(text)
+        if self._state.attributedStringKey != (txt, align, colorSpace, formatting):
+            text.clear()
+            text.append(txt, align=align)
+            # append only changes the align, no need to collect the formatting again
+            formatting["align"] = text._align
+            self._state.attributedStringKey = txt, align, colorSpace, formatting
+        return text.getNSObject()
+
+    def _textFormatting(self, text):
+        # all formatting attributes, the mutable ones are copied to compare them by value later
+        formatting = dict()
+        for key in text._formattedAttributes:
+            value = getattr(text, "_%s" % key)
+            if isinstance(value, dict):
+                value = dict(value)
+            elif isinstance(value, list):
+                value = list(value)
+            formatting[key] = value
+        return formatting
 
     def hyphenateAttributedString(self, attrString, path):
+        softHyphen = chr(self._softHypen)
         # add soft hyphens
         attrString = attrString.mutableCopy()
         mutString = attrString.mutableString()
@@ -2465,12 +2688,12 @@ class BaseContext(object):
             while hyphenIndex != AppKit.NSNotFound:
                 hyphenIndex = attrString.lineBreakByHyphenatingBeforeIndex_withinRange_(hyphenIndex, wordRange)
                 if hyphenIndex != AppKit.NSNotFound:
-                    mutString.insertString_atIndex_(chr(self._softHypen), hyphenIndex)
+                    mutString.insertString_atIndex_(softHyphen, hyphenIndex)
 
         # get the lines
         lines = self._getTypesetterLinesWithPath(attrString, path)
-        # get all lines justified
-        justifiedLines = self._getTypesetterLinesWithPath(self._justifyAttributedString(attrString), path)
+        # the justified lines are only laid out when a line ends with a soft hyphen
+        justifiedLines = None
 
         # loop over all lines
         i = 0
@@ -2484,8 +2707,11 @@ class BaseContext(object):
             # get the string
             subStringText = subString.string()
             # check if the line ends with a softhypen
-            if len(subStringText) and subStringText[-1] == chr(self._softHypen):
+            if len(subStringText) and subStringText[-1] == softHyphen:
                 # here we go
+                if justifiedLines is None:
+                    # get all lines justified
+                    justifiedLines = self._getTypesetterLinesWithPath(self._justifyAttributedString(attrString), path)
                 # get the justified line and get the max line width
                 maxLineWidth, a, d, l = CoreText.CTLineGetTypographicBounds(justifiedLines[i], None, None, None)
                 # get the last attributes
@@ -2507,30 +2733,31 @@ class BaseContext(object):
                     lineBreak = possibleLineBreaks.pop(0)
                     # get a possible line
                     breakString = subString.attributedSubstringFromRange_((0, lineBreak))
+                    breakStringText = breakString.string()
                     # get the width
                     stringWidth = breakString.size().width
                     # add hyphen width if required
-                    if breakString.string()[-1] == chr(self._softHypen):
+                    if breakStringText[-1] == softHyphen:
                         stringWidth += hyphenWidth
                     # found a break
                     if stringWidth <= maxLineWidth:
                         breakFound = True
                         break
 
-                if breakFound and len(breakString.string()) > 2 and breakString.string()[-1] == chr(self._softHypen):
+                if breakFound and len(breakStringText) > 2 and breakStringText[-1] == softHyphen:
                     # if the break line ends with a soft hyphen
                     # add a hyphen
                     attrString.replaceCharactersInRange_withString_((rng.location + lineBreak, 0), "-")
                 # remove all soft hyphens for the range of that line
-                mutString.replaceOccurrencesOfString_withString_options_range_(chr(self._softHypen), "", AppKit.NSLiteralSearch, rng)
+                mutString.replaceOccurrencesOfString_withString_options_range_(softHyphen, "", AppKit.NSLiteralSearch, rng)
                 # reset the lines, from the adjusted attribute string
                 lines = self._getTypesetterLinesWithPath(attrString, path)
-                # reset the justifed lines form the adjusted attributed string
-                justifiedLines = self._getTypesetterLinesWithPath(self._justifyAttributedString(attrString), path)
+                # reset the justifed lines, they are laid out again from the adjusted attributed string when needed
+                justifiedLines = None
             # next line
             i += 1
         # remove all soft hyphen
-        mutString.replaceOccurrencesOfString_withString_options_range_(chr(self._softHypen), "", AppKit.NSLiteralSearch, (0, mutString.length()))
+        mutString.replaceOccurrencesOfString_withString_options_range_(softHyphen, "", AppKit.NSLiteralSearch, (0, mutString.length()))
         # done!
         return attrString
 
@@ -2538,20 +2765,27 @@ class BaseContext(object):
         path, origin = self._getPathForFrameSetter(box)
         attrString = self.attributedString(txt, align=align)
         if self._state.hyphenation:
-            hyphenIndexes = [i for i, c in enumerate(attrString.string()) if c == "-"]
+            # collect the existing hyphens with str.find, avoids looping over each character
+            hyphenIndexes = []
+            text = attrString.string()
+            hyphenIndex = text.find("-")
+            while hyphenIndex != -1:
+                hyphenIndexes.append(hyphenIndex)
+                hyphenIndex = text.find("-", hyphenIndex + 1)
             attrString = self.hyphenateAttributedString(attrString, path)
         setter = CoreText.CTFramesetterCreateWithAttributedString(attrString)
         box = CoreText.CTFramesetterCreateFrame(setter, (0, 0), path, None)
         visibleRange = CoreText.CTFrameGetVisibleStringRange(box)
         clip = visibleRange.length
         if self._state.hyphenation:
-            subString = attrString.string()[:clip]
+            # count the hyphens in the visible part of the hyphenated text without slicing it
+            visibleHyphenCount = attrString.string().count("-", 0, clip)
             for i in hyphenIndexes:
                 if i < clip:
                     clip += 1
                 else:
                     break
-            clip -= subString.count("-")
+            clip -= visibleHyphenCount
         return txt[clip:]
 
     def _justifyAttributedString(self, attr):
@@ -2612,6 +2846,12 @@ class BaseContext(object):
     def installFont(self, path):
         url = AppKit.NSURL.fileURLWithPath_(path)
         success, error = CoreText.CTFontManagerRegisterFontsForURL(url, CoreText.kCTFontManagerScopeProcess, None)
+        _fontCache.clear()
+        _fontNameCache.clear()
+        _decoratedFontCache.clear()
+        _textFrameCache.clear()
+        _emptyGlyphCache.clear()
+        self._resetTextStates()
         if not success:
             error = error.localizedDescription()
         return success, error
@@ -2619,10 +2859,22 @@ class BaseContext(object):
     def uninstallFont(self, path):
         url = AppKit.NSURL.fileURLWithPath_(path)
         success, error = CoreText.CTFontManagerUnregisterFontsForURL(url, CoreText.kCTFontManagerScopeProcess, None)
+        _fontCache.clear()
+        _fontNameCache.clear()
+        _decoratedFontCache.clear()
+        _textFrameCache.clear()
+        _emptyGlyphCache.clear()
+        self._resetTextStates()
         if not success:
             error = error.localizedDescription()
         return success, error
 
+    def _resetTextStates(self):
+        # a font with the same name can resolve to a different font now
+        for state in [self._state] + self._stack:
+            state.attributedStringKey = None
+            state.text._resolvedFont = None
+
     def _fontNameForPath(self, path):
         from fontTools.ttLib import TTFont, TTLibError
         try:
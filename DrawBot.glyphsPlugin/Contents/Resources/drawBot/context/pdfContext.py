@@ -1,7 +1,5 @@
 from __future__ import absolute_import
 
-import platform
-from distutils.version import StrictVersion
 import AppKit
 import CoreText
 import Quartz
@@ -10,11 +8,7 @@ from .tools import gifTools
 
 from .baseContext import BaseContext
 from drawBot.misc import DrawBotError, isPDF, isGIF
-
-
-osVersionCurrent = StrictVersion(platform.mac_ver()[0])
-osVersion10_11 = StrictVersion("10.11")
-osVersion10_13 = StrictVersion("10.13")
+from drawBot.macOSVersion import macOSVersion
 
 
 def sendPDFtoPrinter(pdfDocument):
@@ -209,7 +203,7 @@ class PDFContext(BaseContext):
                         Quartz.CGContextSetLineJoin(self._pdfContext, self._state.lineJoin)
                 if fillColor is not None and strokeColor is not None:
                     drawingMode = Quartz.kCGTextFillStroke
-                    if osVersionCurrent >= osVersion10_11 and osVersion10_11 < osVersion10_13:
+                    if macOSVersion >= (10, 11):
                         # solve bug in OSX where the stroke color is the same as the fill color
                         # simple solution: draw it twice...
                         drawingMode = Quartz.kCGTextFill
@@ -90,11 +90,6 @@ class SVGGradient(Gradient):
         super(SVGGradient, self).__init__(*args, **kwargs)
         self.tagID = self._idGenerator.gen()
 
-    def copy(self):
-        new = super(SVGShadow, self).copy()
-        new.tagID = self.tagID
-        return new
-
     def writeDefs(self, ctx):
         ctx.begintag("defs")
         ctx.newline()
@@ -162,11 +157,6 @@ class SVGShadow(Shadow):
         super(SVGShadow, self).__init__(*args, **kwargs)
         self.tagID = self._idGenerator.gen()
 
-    def copy(self):
-        new = super(SVGShadow, self).copy()
-        new.tagID = self.tagID
-        return new
-
     def writeDefs(self, ctx):
         ctx.begintag("defs")
         ctx.newline()
@@ -468,3 +468,8 @@ for key, value in _featureMap.items():
     }
     featureMap[key] = feature
     reversedFeatureMap[(featureType, featureSelector)] = key
+
+# the disabled feature for each tag, saves building the "<tag>_off" key
+featureMapOff = dict()
+for tag, sel, on, off in _coreTextfeatureData:
+    featureMapOff[tag] = featureMap["%s_off" % tag]
@@ -1763,6 +1763,9 @@ class DrawBotDrawingTool(object):
                 txt = txt.decode("utf-8")
             except UnicodeEncodeError:
                 pass
+        if isinstance(txt, self._formattedStringClass):
+            # the instruction is drawn later, a `+=` on the same formatted string must not change it
+            txt = txt.copy()
         if align is None:
             align = "left"
         elif align not in self._dummyContext._textAlignMap.keys():
@@ -2230,6 +2233,15 @@ class DrawBotDrawingTool(object):
         """
         return self._dummyContext._state.text.fontLineHeight()
 
+    def fontMetrics(self):
+        """
+        Returns all metrics of the current font at once as a named tuple:
+        `ascender`, `descender`, `xHeight`, `capHeight`, `leading` and `lineHeight`,
+        based on the current `font` and `fontSize`.
+        If a `lineHeight` is set, this value will be returned as `lineHeight`.
+        """
+        return self._dummyContext._state.text.fontMetrics()
+
     _bezierPathClass = BezierPath
 
     def BezierPath(self, path=None, glyphSet=None):
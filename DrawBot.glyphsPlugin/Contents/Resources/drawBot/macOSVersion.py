@@ -1,6 +1,5 @@
-from distutils.version import StrictVersion
 import platform
 
-# It is safe to compare osVersion to strings, as StrictVersion casts strings
-# to StrictVersion instances upon compare.
-macOSVersion = StrictVersion(platform.mac_ver("0.0.0")[0])
+# The macOS version as a tuple of integers, parsed once on import.
+# Compare it to tuples: `macOSVersion >= (10, 13)`.
+macOSVersion = tuple(int(part) for part in platform.mac_ver("0.0.0")[0].split("."))
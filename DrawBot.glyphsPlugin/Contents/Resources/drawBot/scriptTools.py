@@ -14,16 +14,15 @@ from signal import SIGINT
 import ctypes
 from ctypes.util import find_library
 import threading
-from distutils.version import StrictVersion
-import platform
+import hashlib
+from collections import OrderedDict
+from contextlib import contextmanager
 PY2 = sys.version_info[0] == 2
 PY3 = sys.version_info[0] == 3
 from drawBot.misc import getDefault #, warnings ?? there is a conflict with `import warnings` in line 12
+from drawBot.macOSVersion import macOSVersion
 from objc import super
 
-osVersionCurrent = StrictVersion(platform.mac_ver()[0])
-osVersion10_10 = StrictVersion("10.10")
-
 
 # Pulling in CheckEventQueueForUserCancel from Carbon.framework
 CheckEventQueueForUserCancel = None
@@ -50,42 +49,77 @@ class StdOutput(object):
         self._previousFlush = time.time()
 
     def write(self, data):
-        # get all warnings
-        warnFilters = list(warnings.filters)
-        # reset warnings
-        warnings.resetwarnings()
-        # ignore all warnings
-        # we dont want warnings while pusing text to the textview
-        warnings.filterwarnings("ignore")
         if PY2 and isinstance(data, str):
             try:
                 data = unicode(data, "utf-8", "replace")
             except UnicodeDecodeError:
                 data = "XXX " + repr(data)
+        self.data.append((data, self.isError))
         if self.outputView is not None:
-            # Better not get SIGINT/KeyboardInterrupt exceptions while we're updating the output view
-            with cancelLock:
-                self.outputView.append(data, self.isError)
-                t = time.time()
-                if t - self._previousFlush > 0.2:
-                    self.outputView.scrollToEnd()
-                    if osVersionCurrent >= osVersion10_10:
-                        AppKit.NSRunLoop.mainRunLoop().runUntilDate_(AppKit.NSDate.dateWithTimeIntervalSinceNow_(0.0001))
-                    self._previousFlush = t
-        else:
-            self.data.append((data, self.isError))
-        # reset the new warnings
-        warnings.resetwarnings()
-        # update with the old warnings filters
-        warnings.filters.extend(warnFilters)
+            t = time.time()
+            if t - self._previousFlush > 0.2:
+                with _ignoreWarnings():
+                    # Better not get SIGINT/KeyboardInterrupt exceptions while we're updating the output view
+                    with cancelLock:
+                        self._flushToOutputView()
+                        self.outputView.scrollToEnd()
+                        if macOSVersion >= (10, 10):
+                            AppKit.NSRunLoop.mainRunLoop().runUntilDate_(AppKit.NSDate.dateWithTimeIntervalSinceNow_(0.0001))
+                self._previousFlush = t
+
+    def _flushToOutputView(self):
+        # the output list can be shared by stdout and stderr
+        for text, isError in coalesceOutput(self.data):
+            self.outputView.append(text, isError)
+        del self.data[:]
 
     def flush(self):
-        pass
+        if self.outputView is not None and self.data:
+            with _ignoreWarnings():
+                with cancelLock:
+                    self._flushToOutputView()
 
     def close(self):
         pass
 
 
+def coalesceOutput(output):
+    """
+    Join consecutive `(text, isError)` items of an output list
+    with the same isError flag, keeping the order.
+    """
+    result = []
+    text = []
+    isError = None
+    for data, dataIsError in output:
+        if text and dataIsError != isError:
+            result.append(("".join(text), isError))
+            text = []
+        isError = dataIsError
+        text.append(data)
+    if text:
+        result.append(("".join(text), isError))
+    return result
+
+
+@contextmanager
+def _ignoreWarnings():
+    # we dont want warnings while pusing text to the textview
+    # get all warnings
+    warnFilters = list(warnings.filters)
+    # reset warnings
+    warnings.resetwarnings()
+    # ignore all warnings
+    warnings.filterwarnings("ignore")
+    try:
+        yield
+    finally:
+        # reset the new warnings
+        warnings.resetwarnings()
+        # update with the old warnings filters
+        warnings.filters.extend(warnFilters)
+
+
 def _addLocalSysPaths():
     version = "%s.%s" % (sys.version_info.major, sys.version_info.minor)
     if PY3:
@@ -126,6 +160,34 @@ class _Helper(object):
         return pydoc.help(*args, **kwds)
 
 
+class CompiledCodeCache(object):
+    """
+    A small LRU cache of compiled code objects, keyed by file name, compile
+    flags and a hash of the source. Running the same unchanged script twice
+    will reuse the code object from the first run.
+    """
+
+    def __init__(self, maxSize=8):
+        self.maxSize = maxSize
+        self._codes = OrderedDict()
+
+    def compile(self, source, fileName, compileFlags=0):
+        data = source
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        key = (fileName, compileFlags, hashlib.sha1(data).digest())
+        code = self._codes.pop(key, None)
+        if code is None:
+            code = compile(source, fileName, "exec", compileFlags, dont_inherit=True)
+            if len(self._codes) >= self.maxSize:
+                self._codes.popitem(last=False)
+        self._codes[key] = code
+        return code
+
+    def clear(self):
+        self._codes.clear()
+
+
 # Regex taken from http://legacy.python.org/dev/peps/pep-0263/
 _encodingDeclarationPattern = re.compile(r"^[ \t\v]*#.*?coding[:=][ \t]*([-_.a-zA-Z0-9]+)")
 
@@ -140,7 +202,7 @@ def hasEncodingDeclaration(source):
     return False
 
 
-def ScriptRunner(text=None, path=None, stdout=None, stderr=None, namespace=None, checkSyntaxOnly=False):
+def ScriptRunner(text=None, path=None, stdout=None, stderr=None, namespace=None, checkSyntaxOnly=False, codeCache=None):
 
     def userCancelledMonitor():
         # This will be called from a thread
@@ -199,7 +261,10 @@ def ScriptRunner(text=None, path=None, stdout=None, stderr=None, namespace=None,
 
     try:
         try:
-            code = compile(source + '\n\n', fileName, "exec", compileFlags, dont_inherit=True)
+            if codeCache is not None:
+                code = codeCache.compile(source + '\n\n', fileName, compileFlags)
+            else:
+                code = compile(source + '\n\n', fileName, "exec", compileFlags, dont_inherit=True)
         except:
             traceback.print_exc(0)
         else: